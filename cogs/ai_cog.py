@@ -1,39 +1,149 @@
 import discord
 from discord.ext import commands
+import aiohttp
+import asyncio
+import hashlib
+import io
 import os
-import requests
-import json
+import orjson
+import time
+
+from utils.http import AdaptiveRequester
+from utils.ratelimit import RateLimiter
 
 class AICog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.session = None  # aiohttp.ClientSession, created in cog_load
+        self.http = None     # AdaptiveRequester wrapping the session
+        self.limiter = RateLimiter()  # AIMD throttle for the Gemini API
+        self._inflight = {}  # prompt hash -> Future resolving to generated text
+        # Static request skeleton: only the prompt varies per call, so build
+        # the headers and generation config once instead of per invocation.
+        self._headers = {'Content-Type': 'application/json'}
+        self._gen_config = {
+            "temperature": 0.7, # A balance between creativity and predictability for chat
+            "maxOutputTokens": 1024, # Max tokens for the response
+        }
         self.gemini_api_key = os.getenv("GEMINI_API_KEY")
         if self.gemini_api_key:
-            # Construct the full API URL with the key
+            # Construct the full API URLs with the key
             self.gemini_api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={self.gemini_api_key}"
+            self.gemini_stream_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:streamGenerateContent?alt=sse&key={self.gemini_api_key}"
         else:
             self.gemini_api_url = None
+            self.gemini_stream_url = None
             print("AICog WARNING: GEMINI_API_KEY not found in .env. AI chat features will not work.")
 
+    async def cog_load(self):
+        # Bot-wide pooled session (owned by main); generations get a longer
+        # per-request budget than the session default below.
+        self.session = self.bot.http_session
+        self.http = AdaptiveRequester(self.session)
+
+    async def _stream_gemini_response(self, ctx, headers, payload):
+        """Stream a Gemini response over SSE, showing text as it arrives.
+
+        The Discord message is created on the first chunk and edited roughly
+        twice a second as more text streams in, so the user sees output long
+        before the full body has been generated. Returns the complete text,
+        or None if streaming produced nothing (caller falls back to the
+        non-streaming endpoint).
+        """
+        buffer = ""
+        msg = None
+        last_edit = 0.0
+        try:
+            async with self.limiter, self.http.post(self.gemini_stream_url, headers=headers, json=payload,
+                                                    limiter=self.limiter,
+                                                    timeout=aiohttp.ClientTimeout(total=30)) as response:
+                response.raise_for_status()
+                async for raw_line in response.content:
+                    line = raw_line.strip()
+                    if not line.startswith(b"data:"):
+                        continue
+                    event = orjson.loads(line[5:])
+                    candidates = event.get("candidates")
+                    if not candidates:
+                        continue
+                    for part in candidates[0].get("content", {}).get("parts", []):
+                        buffer += part.get("text", "")
+                    # Throttle edits to stay well under Discord's rate limits
+                    now = time.monotonic()
+                    if buffer and now - last_edit >= 0.5 and len(buffer) <= 1990:
+                        if msg is None:
+                            msg = await ctx.send(buffer)
+                        else:
+                            await msg.edit(content=buffer)
+                        last_edit = now
+        except (aiohttp.ClientError, asyncio.TimeoutError, orjson.JSONDecodeError) as e:
+            if msg is not None:
+                # Partial output is already on screen; keep it rather than
+                # falling back and double-posting.
+                print(f"Gemini API (AICog) stream interrupted: {e}")
+                return buffer
+            print(f"Gemini API (AICog) streaming failed, falling back to non-streaming: {e}")
+            return None
+
+        if not buffer:
+            return None
+
+        # Final flush so the message always shows the complete text
+        if len(buffer) <= 2000:
+            if msg is None:
+                await ctx.send(buffer)
+            else:
+                await msg.edit(content=buffer)
+        else:
+            chunks = [buffer[i:i+1990] for i in range(0, len(buffer), 1990)]
+            if msg is None:
+                msg = await ctx.send(chunks[0])
+            else:
+                await msg.edit(content=chunks[0])
+            for chunk in chunks[1:]:
+                await ctx.send(chunk)
+        return buffer
+
+    async def _send_response_text(self, ctx, generated_text):
+        """Deliver generated text within Discord's 2000-character limit.
+
+        Short responses go out as-is; moderately long ones are pre-chunked
+        and sent sequentially (order matters); very long ones become a single
+        .txt attachment — one REST call instead of many.
+        """
+        if len(generated_text) <= 2000:
+            await ctx.send(generated_text)
+            return
+
+        chunks = [generated_text[i:i+1990] for i in range(0, len(generated_text), 1990)]
+        if len(chunks) > 3:
+            buffer = io.BytesIO(generated_text.encode('utf-8'))
+            await ctx.send("The response is quite long, so here it is as a file:",
+                           file=discord.File(buffer, "response.txt"))
+            return
+
+        for chunk in chunks:
+            await ctx.send(chunk, suppress_embeds=True)
+
+    async def cog_command_error(self, ctx, error):
+        if isinstance(error, commands.CheckFailure):
+            await ctx.send("Error: GEMINI_API_KEY not configured. Please contact the bot owner.")
+
     @commands.command(name='ask', aliases=['chat', 'q'])
+    @commands.check(lambda ctx: ctx.cog.gemini_api_key is not None)
     async def ask_gemini(self, ctx, *, prompt: str):
         """Sends a prompt to the Gemini AI and returns the response.
 
-        Example: 
+        Example:
         !ask What is the capital of France?
         """
-        if not self.gemini_api_key:
-            await ctx.send("Error: GEMINI_API_KEY not configured. Please contact the bot owner.")
-            return
-
         if not prompt:
             await ctx.send("Please provide a question or prompt after the command. Example: `!ask Who are you?`")
             return
 
-        headers = {
-            'Content-Type': 'application/json',
-        }
-        # Basic payload structure for gemini-pro
+        headers = self._headers
+        # Basic payload structure for gemini-pro; only the prompt wrapper is
+        # allocated per call, the generation config is shared
         payload = {
             "contents": [
                 {
@@ -42,37 +152,50 @@ class AICog(commands.Cog):
                     ]
                 }
             ],
-            "generationConfig": {
-              "temperature": 0.7, # A balance between creativity and predictability for chat
-              "maxOutputTokens": 1024, # Max tokens for the response
-            }
+            "generationConfig": self._gen_config
         }
-        
-        # self.gemini_api_url now contains the key, so we use it directly
 
-        if not self.gemini_api_url: # Check if URL was constructed (i.e. API key was present)
-            await ctx.send("Error: GEMINI_API_KEY not configured or missing. AI chat is unavailable.")
+        # self.gemini_api_url contains the key; its presence is guaranteed by
+        # the command check above, so no per-call guard is needed here.
+
+        # Singleflight: if an identical prompt is already in flight, await its
+        # result instead of spending another API call and quota on it.
+        key = hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            generated_text = await inflight
+            if generated_text:
+                await self._send_response_text(ctx, generated_text)
+            else:
+                await ctx.send("Sorry, I couldn't get a valid response from the AI. Please try again.")
             return
 
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+
         try:
             async with ctx.typing(): # Show "Bot is typing..."
-                # self.gemini_api_url now contains the API key
-                response = requests.post(self.gemini_api_url, headers=headers, data=json.dumps(payload), timeout=30) 
-                response.raise_for_status()  # Raise an exception for HTTP errors (4xx or 5xx)
-                
-                response_json = response.json()
-                
-                # print(json.dumps(response_json, indent=2)) # For debugging the full response
+                # Prefer the SSE streaming endpoint so the first tokens reach
+                # the user while the rest of the response is still generating.
+                streamed_text = await self._stream_gemini_response(ctx, headers, payload)
+                if streamed_text is not None:
+                    future.set_result(streamed_text)
+                    return
+
+                # Non-streaming fallback; self.gemini_api_url contains the API key
+                async with self.limiter, self.http.post(self.gemini_api_url, headers=headers, json=payload,
+                                                        limiter=self.limiter,
+                                                        timeout=aiohttp.ClientTimeout(total=30)) as response:
+                    response.raise_for_status()  # Raise an exception for HTTP errors (4xx or 5xx)
+
+                    response_json = orjson.loads(await response.read())
+
+                # print(orjson.dumps(response_json, option=orjson.OPT_INDENT_2).decode()) # For debugging the full response
 
                 if response_json.get("candidates") and response_json["candidates"][0].get("content", {}).get("parts"):
                     generated_text = response_json["candidates"][0]["content"]["parts"][0]["text"]
-                    
-                    # Send response in chunks if it's too long for a single Discord message
-                    if len(generated_text) > 2000:
-                        for i in range(0, len(generated_text), 2000):
-                            await ctx.send(generated_text[i:i+2000])
-                    else:
-                        await ctx.send(generated_text)
+                    future.set_result(generated_text)
+                    await self._send_response_text(ctx, generated_text)
                 elif response_json.get("promptFeedback"):
                     feedback = response_json.get("promptFeedback")
                     block_reason = feedback.get("blockReason", "No specific reason provided.")
@@ -80,33 +203,28 @@ class AICog(commands.Cog):
                     await ctx.send(f"Sorry, your prompt was blocked. Reason: {block_reason}. Safety Ratings: {safety_ratings}")
                 else:
                     await ctx.send("Sorry, I couldn't get a valid response from the AI. The response format might have changed or an unknown error occurred.")
-                    print(f"Gemini API unexpected response: {json.dumps(response_json, indent=2)}")
+                    print(f"Gemini API unexpected response: {orjson.dumps(response_json, option=orjson.OPT_INDENT_2).decode()}")
 
-        except requests.exceptions.Timeout:
+        except asyncio.TimeoutError:
             await ctx.send("The request to the AI service timed out. Please try again later.")
             print("Gemini API (AICog) request timed out.")
-        except requests.exceptions.HTTPError as e: # Handles 4xx/5xx from raise_for_status()
-            error_message = "No response details available."
-            if e.response is not None:
-                try:
-                    error_details = e.response.json()
-                    error_message = error_details.get("error", {}).get("message", e.response.text)
-                except json.JSONDecodeError:
-                    error_message = e.response.text
-            else:
-                error_message = str(e)
-            await ctx.send(f"An HTTP error occurred with the AI service. Status: {e.response.status_code if e.response else 'N/A'}. Please check logs.")
-            print(f"Gemini API (AICog) HTTPError: {e} - Status: {e.response.status_code if e.response else 'N/A'} - Response: {error_message}")
-        except requests.exceptions.RequestException as e: # Other network issues
-            error_text = e.response.text if hasattr(e, 'response') and e.response is not None else 'No response data'
+        except aiohttp.ClientResponseError as e: # Handles 4xx/5xx from raise_for_status()
+            await ctx.send(f"An HTTP error occurred with the AI service. Status: {e.status}. Please check logs.")
+            print(f"Gemini API (AICog) HTTP error: {e.status} {e.message}")
+        except aiohttp.ClientError as e: # Other network issues
             await ctx.send(f"An error occurred while communicating with the AI service. Please check logs.")
-            print(f"Error calling Gemini API (AICog): {e} - Response: {error_text}")
-        except json.JSONDecodeError as e:
+            print(f"Error calling Gemini API (AICog): {e}")
+        except orjson.JSONDecodeError as e:
             await ctx.send("There was an issue processing the AI's response. Please try again.")
             print(f"Error decoding JSON from Gemini API (AICog): {e}")
         except Exception as e:
             await ctx.send(f"An unexpected error occurred with the AI service. Please check logs.")
             print(f"An unexpected error occurred with Gemini API (AICog): {e}")
+        finally:
+            self._inflight.pop(key, None)
+            if not future.done():
+                # Resolve to None so coalesced waiters report failure cleanly
+                future.set_result(None)
 
 async def setup(bot):
     await bot.add_cog(AICog(bot))
@@ -1,124 +1,170 @@
 import discord
 from discord.ext import commands
+import aiohttp
+import asyncio
+import logging
 import os
-import requests
-import json
+import orjson
 import random
 from typing import Optional
 
+from utils.cache import JsonFileCache
+from utils.http import AdaptiveRequester
+from utils.ratelimit import RateLimiter
+
 class EventsCog(commands.Cog):
+    STICKER_CACHE_TTL = 86400  # seconds; GIPHY sticker URLs stay valid for days
+
     def __init__(self, bot):
         self.bot = bot
+        self.log = logging.getLogger("events")
+        self.session = None  # aiohttp.ClientSession, created in cog_load
+        self.http = None     # AdaptiveRequester wrapping the session
+        self.giphy_limiter = RateLimiter()  # AIMD throttle for the GIPHY API
         self.giphy_api_key = os.getenv("GIPHY_API_KEY")
-        
+
         if not self.giphy_api_key:
-            print("Warning: GIPHY_API_KEY not found in .env. Welcome stickers will not work.")
-            
-        self.giphy_sticker_url = "https://api.giphy.com/v1/stickers/translate"
+            self.log.warning("GIPHY_API_KEY not found in .env. Welcome stickers will not work.")
+
         self.welcome_channel_name = "general"  # Target channel for welcome messages
+        self._welcome_channels = {}  # guild_id -> resolved welcome channel id
+        # Persistent sticker-URL cache so warm restarts skip the GIPHY call
+        self.sticker_cache = JsonFileCache("cache/giphy_stickers.json", max_entries=8)
+
+    async def cog_load(self):
+        # Bot-wide pooled session (owned by main), shared across all cogs
+        self.session = self.bot.http_session
+        self.http = AdaptiveRequester(self.session)
 
     async def _fetch_welcome_sticker(self) -> Optional[str]:
         """Fetch a random welcome sticker from GIPHY."""
         if not self.giphy_api_key:
             return None
 
-        # First, search for waving welcome stickers to get total count
+        # One search call: fetch a page of waving welcome stickers and pick
+        # one client-side, instead of a count query plus a translate query.
         search_params = {
             "api_key": self.giphy_api_key,
             "q": "welcome wave hi hello greeting",
-            "limit": 1,  # We only need the total count
+            "limit": 25,
             "rating": "g",
             "lang": "en",
             "bundle": "messaging_non_clips"  # Focus on messaging/sticker content
         }
-        
+
+        # The query is fixed, so the URL list can be reused across joins and
+        # restarts while the cache entry is fresh.
+        urls = self.sticker_cache.get("welcome", ttl=self.STICKER_CACHE_TTL)
+        if urls:
+            return random.choice(urls)
+
         try:
-            # Get total count of available stickers
             search_url = "https://api.giphy.com/v1/stickers/search"
-            search_response = requests.get(search_url, params=search_params, timeout=10)
-            search_response.raise_for_status()
-            search_data = search_response.json()
-            
-            total_count = search_data.get("pagination", {}).get("total_count", 0)
-            if total_count == 0:
+            async with self.giphy_limiter, self.http.get(search_url, params=search_params,
+                                                          limiter=self.giphy_limiter) as response:
+                response.raise_for_status()
+                data = orjson.loads(await response.read())
+
+            stickers = data.get("data") or []
+            urls = [url for sticker in stickers
+                    if (url := sticker.get("images", {}).get("original", {}).get("url"))]
+            if not urls:
                 return None
-                
-            # Get a random offset (limited to first 1000 results as per GIPHY API)
-            offset = min(random.randint(0, total_count - 1), 1000)
-            
-            # Now fetch a random waving sticker
-            params = {
-                "api_key": self.giphy_api_key,
-                "s": "welcome wave hi",
-                "weirdness": 5,  # Keep it more focused on the query
-                "rating": "g",
-                "bundle": "messaging_non_clips",
-                "offset": offset
-            }
-            
-            response = requests.get(self.giphy_sticker_url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data.get("data", {}).get("images", {}).get("original", {}).get("url"):
-                return data["data"]["images"]["original"]["url"]
-                
-        except requests.exceptions.RequestException as e:
-            print(f"[EventsCog] GIPHY API request error for welcome sticker: {e}")
-        except json.JSONDecodeError as e:
-            print(f"[EventsCog] GIPHY API JSON decode error: {e}")
+
+            self.sticker_cache.set("welcome", urls)
+            return random.choice(urls)
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.log.warning("GIPHY API request error for welcome sticker: %s", e)
+        except orjson.JSONDecodeError as e:
+            self.log.warning("GIPHY API JSON decode error: %s", e)
         except Exception as e:
-            print(f"[EventsCog] Unexpected error fetching GIPHY sticker: {e}")
+            self.log.exception("Unexpected error fetching GIPHY sticker: %s", e)
             
         return None
 
-    @commands.Cog.listener()
-    async def on_member_join(self, member: discord.Member):
-        print(f"{member.name}#{member.discriminator} (ID: {member.id}) just joined {member.guild.name} (ID: {member.guild.id})")
-
-        welcome_channel = discord.utils.get(member.guild.text_channels, name=self.welcome_channel_name)
+    def _resolve_welcome_channel(self, guild: discord.Guild) -> Optional[discord.TextChannel]:
+        """Full channel-list scan used on a welcome-channel cache miss."""
+        welcome_channel = discord.utils.get(guild.text_channels, name=self.welcome_channel_name)
 
         if not welcome_channel:
-            print(f"[EventsCog] Primary welcome channel '{self.welcome_channel_name}' not found in guild '{member.guild.name}'. Trying fallbacks...")
+            self.log.info("Primary welcome channel '%s' not found in guild '%s'. Trying fallbacks...", self.welcome_channel_name, guild.name)
             # Fallback 1: System Channel
-            welcome_channel = member.guild.system_channel
-            if welcome_channel and welcome_channel.permissions_for(member.guild.me).send_messages:
-                print(f"[EventsCog] Using system channel '{welcome_channel.name}' as fallback.")
+            welcome_channel = guild.system_channel
+            if welcome_channel and welcome_channel.permissions_for(guild.me).send_messages:
+                self.log.info("Using system channel '%s' as fallback.", welcome_channel.name)
             else:
                 if welcome_channel: # System channel exists but bot can't send to it
-                    print(f"[EventsCog] System channel '{welcome_channel.name}' found, but bot lacks send permissions. Looking for other channels...")
+                    self.log.info("System channel '%s' found, but bot lacks send permissions. Looking for other channels...", welcome_channel.name)
                 else: # No system channel
-                    print(f"[EventsCog] No system channel found. Looking for other text channels...")
+                    self.log.info("No system channel found. Looking for other text channels...")
                 welcome_channel = None # Reset for next fallback
                 # Fallback 2: First available text channel where bot can send messages
-                for channel in member.guild.text_channels:
-                    if channel.permissions_for(member.guild.me).send_messages:
+                for channel in guild.text_channels:
+                    if channel.permissions_for(guild.me).send_messages:
                         welcome_channel = channel
-                        print(f"[EventsCog] Using first available text channel '{welcome_channel.name}' as fallback.")
+                        self.log.info("Using first available text channel '%s' as fallback.", welcome_channel.name)
                         break
-            
+
+        return welcome_channel
+
+    # Channel changes can alter which channel we should welcome people in,
+    # so drop the cached resolution and re-scan on the next join.
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        self._welcome_channels.pop(channel.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        self._welcome_channels.pop(channel.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        # Renames and permission-overwrite edits both arrive here, and either
+        # can change which channel we should (or can) welcome people in
+        self._welcome_channels.pop(after.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        # member.name only: discriminators are "0" for migrated usernames, and
+        # lazy %-formatting keeps the hot path allocation-free when filtered
+        self.log.info("%s (ID: %s) just joined %s (ID: %s)", member.name, member.id, member.guild.name, member.guild.id)
+
+        # Fast path: the resolved channel id is cached per guild, avoiding the
+        # O(channels) scan with per-channel permission merges on every join.
+        welcome_channel = None
+        cached_id = self._welcome_channels.get(member.guild.id)
+        if cached_id:
+            welcome_channel = member.guild.get_channel(cached_id)
+
+        if not welcome_channel:
+            welcome_channel = self._resolve_welcome_channel(member.guild)
             if not welcome_channel:
-                print(f"[EventsCog] No suitable fallback channel found in '{member.guild.name}' to send welcome message.")
+                self.log.info("No suitable fallback channel found in '%s' to send welcome message.", member.guild.name)
                 return
+            self._welcome_channels[member.guild.id] = welcome_channel.id
 
         welcome_message = f"Welcome {member.mention} to **{member.guild.name}**! 👋 We're excited to have you here!"
         
         try:
-            await welcome_channel.send(welcome_message)
-            print(f"[EventsCog] Sent welcome message for {member.name} to #{welcome_channel.name} in {member.guild.name}.")
-
-            # Send a welcome sticker from GIPHY
+            # Fetch the sticker first, then send message + sticker as a single
+            # embed: one Discord REST call instead of two per join.
             sticker_url = await self._fetch_welcome_sticker()
+            embed = discord.Embed(description=welcome_message, color=0x00ffcc)
             if sticker_url:
-                await welcome_channel.send(sticker_url)
-                print(f"[EventsCog] Sent welcome sticker for {member.name} to #{welcome_channel.name} in {member.guild.name}.")
+                embed.set_image(url=sticker_url)
             else:
-                print(f"[EventsCog] No welcome sticker found or API key missing for {member.name}.")
+                self.log.info("No welcome sticker found or API key missing for %s.", member.name)
+            await welcome_channel.send(embed=embed)
+            self.log.info("Sent welcome message for %s to #%s in %s.", member.name, welcome_channel.name, member.guild.name)
 
         except discord.errors.Forbidden:
-            print(f"[EventsCog] Bot missing permissions to send messages in #{welcome_channel.name} of {member.guild.name}.")
+            # The cached channel is no longer sendable; drop it so the next
+            # join re-resolves instead of failing forever
+            self._welcome_channels.pop(member.guild.id, None)
+            self.log.warning("Bot missing permissions to send messages in #%s of %s.", welcome_channel.name, member.guild.name)
         except Exception as e:
-            print(f"[EventsCog] Error sending welcome message/GIF for {member.name}: {e}")
+            self.log.exception("Error sending welcome message/GIF for %s: %s", member.name, e)
 
 async def setup(bot):
     await bot.add_cog(EventsCog(bot))
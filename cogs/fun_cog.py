@@ -1,23 +1,113 @@
 import discord
-from discord.ext import commands
-import requests
-import json
+from discord.ext import commands, tasks
+import aiohttp
+import asyncio
+import collections
+import itertools
+import orjson
 import os
 import random
 
+from utils.cache import JsonFileCache
+from utils.http import AdaptiveRequester
+from utils.ratelimit import RateLimiter
+
 class FunCog(commands.Cog):
+    # Endpoints whose results are interchangeable, so a pre-fetched pool is
+    # indistinguishable from a live fetch but answers instantly.
+    POOL_ENDPOINTS = {
+        'meme': 'https://meme-api.com/gimme',
+        'joke': 'https://official-joke-api.appspot.com/jokes/random',
+        'fact': 'https://uselessfacts.jsph.pl/random.json?language=en',
+        'compliment': 'https://compliments-api.vercel.app/random',
+        'roast': 'https://evilinsult.com/generate_insult.php?lang=en&type=json',
+    }
+    POOL_LOW_WATER = 8    # refill a pool when it drops below this
+    POOL_REFILL_BATCH = 16
+    MEME_BATCH_URL = 'https://meme-api.com/gimme/10'  # one request, ten posts
+    GIF_CACHE_TTL = 86400  # seconds; Tenor GIF URLs stay valid for days
+    GIF_CACHE_MAX = 128    # distinct search terms to remember
+    MAX_EVERYONE = 10     # cap @everyone expansion in compliment/roast
+
     def __init__(self, bot):
         self.bot = bot
+        self.session = None  # aiohttp.ClientSession, created in cog_load
+        self.http = None     # AdaptiveRequester wrapping the session
+        self._pools = {name: collections.deque(maxlen=256) for name in self.POOL_ENDPOINTS}
+        # Persistent cache: normalized search term -> list of GIF URLs, so
+        # popular searches survive bot restarts
+        self.gif_cache = JsonFileCache("cache/tenor_gifs.json", max_entries=self.GIF_CACHE_MAX)
+        self.tenor_limiter = RateLimiter()  # AIMD throttle for the Tenor API
         self.tenor_api_key = os.getenv("TENOR_API_KEY")
         if not self.tenor_api_key:
             print("Warning: TENOR_API_KEY not found in .env. The !gif command will not work.")
-        self.tenor_search_url = "https://tenor.googleapis.com/v2/search" 
+        self.tenor_search_url = "https://tenor.googleapis.com/v2/search"
+
+    async def cog_load(self):
+        # Bot-wide pooled session (owned by main), shared across all cogs
+        self.session = self.bot.http_session
+        self.http = AdaptiveRequester(self.session)
+        self.refill_pools.start()
+
+    async def cog_unload(self):
+        self.refill_pools.cancel()
+
+    @tasks.loop(minutes=5)
+    async def refill_pools(self):
+        """Top up any response pool that has dropped below the low-water mark."""
+        for name, url in self.POOL_ENDPOINTS.items():
+            pool = self._pools[name]
+            if len(pool) >= self.POOL_LOW_WATER:
+                continue
+            if name == 'meme':
+                # meme-api supports batching: one request returns ten posts,
+                # so don't fan out single /gimme calls for this pool
+                try:
+                    data = await self._fetch_one(self.MEME_BATCH_URL)
+                    pool.extend(data.get('memes') or [])
+                except (aiohttp.ClientError, asyncio.TimeoutError, orjson.JSONDecodeError) as e:
+                    print(f"Meme batch refill failed: {e}")
+                continue
+            results = await asyncio.gather(
+                *[self._fetch_one(url) for _ in range(self.POOL_REFILL_BATCH)],
+                return_exceptions=True
+            )
+            pool.extend(r for r in results if not isinstance(r, BaseException))
+
+    @refill_pools.before_loop
+    async def before_refill_pools(self):
+        await self.bot.wait_until_ready()
+
+    async def _pool_get(self, name):
+        """Serve a cached response for `name`, falling back to a live fetch."""
+        pool = self._pools[name]
+        if pool:
+            return pool.popleft()
+        return await self._fetch_one(self.POOL_ENDPOINTS[name])
 
-    def get_meme_url(self): # Renamed to avoid conflict if we add other get_meme functions
-        response = requests.get('https://meme-api.com/gimme')
-        json_data = json.loads(response.text)
+    async def _pool_get_many(self, name, count):
+        """Serve `count` responses, mixing pool hits with concurrent fetches."""
+        pool = self._pools[name]
+        items = [pool.popleft() for _ in range(min(count, len(pool)))]
+        missing = count - len(items)
+        if missing:
+            results = await asyncio.gather(
+                *[self._fetch_one(self.POOL_ENDPOINTS[name]) for _ in range(missing)],
+                return_exceptions=True
+            )
+            items.extend(r for r in results if not isinstance(r, BaseException))
+        return items
+
+    async def get_meme_url(self): # Renamed to avoid conflict if we add other get_meme functions
+        json_data = await self._pool_get('meme')
         return json_data['url']
 
+    async def _fetch_one(self, url):
+        """Fetch a single JSON payload from an API endpoint."""
+        async with self.http.get(url) as response:
+            response.raise_for_status()
+            return orjson.loads(await response.read())
+
     @commands.command(name='meme')
     async def meme(self, ctx):
         """Get a random meme from Reddit.
@@ -31,7 +121,7 @@ class FunCog(commands.Cog):
         Example:
             !meme
         """
-        await ctx.send(self.get_meme_url())
+        await ctx.send(await self.get_meme_url())
 
     @commands.command(name='joke', aliases=['j'])
     async def joke(self, ctx):
@@ -49,20 +139,18 @@ class FunCog(commands.Cog):
             !j
         """
         try:
-            response = requests.get('https://official-joke-api.appspot.com/jokes/random', timeout=10)
-            response.raise_for_status()
-            joke_data = response.json()
-            
+            joke_data = await self._pool_get('joke')
+
             # Format the joke with setup and punchline
             joke_text = f"**{joke_data['setup']}**\n\n{joke_data['punchline']}"
             await ctx.send(joke_text)
-            
-        except requests.exceptions.Timeout:
+
+        except asyncio.TimeoutError:
             await ctx.send("The joke service is taking too long to respond. Please try again later.")
-        except requests.exceptions.RequestException as e:
+        except aiohttp.ClientError as e:
             await ctx.send("Failed to fetch a joke. Please try again later.")
             print(f"Joke API error: {e}")
-        except (json.JSONDecodeError, KeyError) as e:
+        except (orjson.JSONDecodeError, KeyError) as e:
             await ctx.send("Received an invalid response from the joke service.")
             print(f"Joke API response error: {e}")
             
@@ -84,20 +172,18 @@ class FunCog(commands.Cog):
             !uselessfact
         """
         try:
-            response = requests.get('https://uselessfacts.jsph.pl/random.json?language=en', timeout=10)
-            response.raise_for_status()
-            fact_data = response.json()
-            
+            fact_data = await self._pool_get('fact')
+
             # Format the fact with an emoji
             fact_text = f"🤯 **Useless Fact:**\n{fact_data['text']}"
             await ctx.send(fact_text)
-            
-        except requests.exceptions.Timeout:
+
+        except asyncio.TimeoutError:
             await ctx.send("The fact service is taking too long to respond. Please try again later.")
-        except requests.exceptions.RequestException as e:
+        except aiohttp.ClientError as e:
             await ctx.send("Failed to fetch a fact. Please try again later.")
             print(f"Useless Facts API error: {e}")
-        except (json.JSONDecodeError, KeyError) as e:
+        except (orjson.JSONDecodeError, KeyError) as e:
             await ctx.send("Received an invalid response from the fact service.")
             print(f"Useless Facts API response error: {e}")
             
@@ -126,38 +212,51 @@ class FunCog(commands.Cog):
         """
         # Get all mentioned users
         mentioned_users = ctx.message.mentions
-        
-        # Handle @everyone case
-        if ctx.message.content.lower().strip().endswith('@everyone'):
-            mentioned_users = [m for m in ctx.channel.members if not m.bot]
-        
+
+        # Handle @everyone case: lazily take the first few non-bot members
+        # instead of materializing the full computed member list, and send one
+        # consolidated message instead of one per member
+        everyone = ctx.message.content.lower().strip().endswith('@everyone')
+        if everyone:
+            members_iter = (m for m in ctx.channel.members if not m.bot)
+            mentioned_users = list(itertools.islice(members_iter, self.MAX_EVERYONE))
+
         # If no users mentioned, compliment the author
         if not mentioned_users:
             mentioned_users = [ctx.author]
-        
-        # Remove bot from the list if present
-        mentioned_users = [m for m in mentioned_users if m != self.bot.user]
-        
+
+        # Drop bots (including this bot) in one pass; the @everyone branch has
+        # already filtered them, so this only matters for explicit mentions
+        mentioned_users = [m for m in mentioned_users if not m.bot]
+
         if not mentioned_users:
             await ctx.send("No valid users to compliment!")
             return
-            
+
         try:
-            # Get a unique compliment for each user
-            compliments = []
-            for _ in range(len(mentioned_users)):
-                response = requests.get('https://compliments-api.vercel.app/random', timeout=10)
-                response.raise_for_status()
-                compliment_data = response.json()
-                compliments.append(f"🌸 {compliment_data['compliment']}")
-            
+            if everyone:
+                data = await self._pool_get('compliment')
+                mentions = " ".join(user.mention for user in mentioned_users)
+                await ctx.send(f"{mentions} 🌸 {data['compliment']}")
+                return
+
+            # Get a unique compliment for each user: pool hits are instant,
+            # any misses are fetched concurrently (~1 round trip total)
+            results = await self._pool_get_many('compliment', len(mentioned_users))
+
+            pairs = [(user, f"🌸 {data['compliment']}")
+                     for user, data in zip(mentioned_users, results)]
+            if not pairs:
+                await ctx.send("Failed to fetch compliments. Please try again later.")
+                return
+
             # Send compliments to each user
-            for user, compliment in zip(mentioned_users, compliments):
-                await ctx.send(f"{user.mention} {compliment}")
-            
-        except requests.exceptions.Timeout:
+            await asyncio.gather(*[ctx.send(f"{user.mention} {compliment}")
+                                   for user, compliment in pairs])
+
+        except asyncio.TimeoutError:
             await ctx.send("The compliment service is taking too long to respond. Please try again later.")
-        except requests.exceptions.RequestException as e:
+        except aiohttp.ClientError as e:
             await ctx.send("Failed to fetch compliments. Please try again later.")
             print(f"Complimentr API error: {e}")
             
@@ -183,52 +282,70 @@ class FunCog(commands.Cog):
         """
         # Get all mentioned users
         mentioned_users = ctx.message.mentions
-        
-        # Handle @everyone case
-        if ctx.message.content.lower().strip().endswith('@everyone'):
-            mentioned_users = [m for m in ctx.channel.members if not m.bot]
-        
+
+        # Handle @everyone case: lazily take the first few non-bot members
+        # and send one consolidated message instead of one per member
+        everyone = ctx.message.content.lower().strip().endswith('@everyone')
+        if everyone:
+            members_iter = (m for m in ctx.channel.members if not m.bot)
+            mentioned_users = list(itertools.islice(members_iter, self.MAX_EVERYONE))
+
         # If no users mentioned, roast the author
         if not mentioned_users:
             mentioned_users = [ctx.author]
-        
-        # Remove bot from the list if present
-        mentioned_users = [m for m in mentioned_users if m != self.bot.user]
-        
+
+        # Drop bots (including this bot) in one pass; the @everyone branch has
+        # already filtered them, so this only matters for explicit mentions
+        mentioned_users = [m for m in mentioned_users if not m.bot]
+
         if not mentioned_users:
             await ctx.send("No valid users to roast!")
             return
-            
+
         # Add warning about mean content
         warning = "⚠️ **Warning**: Roasts can be mean-spirited. Please use this command responsibly and only with friends who are okay with it!"
-        
+
         try:
-            # Get a unique roast for each user
-            roasts = []
-            for _ in range(len(mentioned_users)):
-                response = requests.get('https://evilinsult.com/generate_insult.php?lang=en&type=json', timeout=10)
-                response.raise_for_status()
-                roast_data = response.json()
-                roasts.append(f"🔥 {roast_data['insult']}")
-            
+            if everyone:
+                data = await self._pool_get('roast')
+                await ctx.send(warning)
+                mentions = " ".join(user.mention for user in mentioned_users)
+                await ctx.send(f"{mentions} 🔥 {data['insult']}")
+                return
+
+            # Get a unique roast for each user: pool hits are instant,
+            # any misses are fetched concurrently
+            results = await self._pool_get_many('roast', len(mentioned_users))
+
+            pairs = [(user, f"🔥 {data['insult']}")
+                     for user, data in zip(mentioned_users, results)]
+            if not pairs:
+                await ctx.send("Failed to fetch roasts. Please try again later.")
+                return
+
             # Send warning first
             await ctx.send(warning)
-            
+
             # Send roasts to each user
-            for user, roast in zip(mentioned_users, roasts):
-                await ctx.send(f"{user.mention} {roast}")
-            
-        except requests.exceptions.Timeout:
+            await asyncio.gather(*[ctx.send(f"{user.mention} {roast}")
+                                   for user, roast in pairs])
+
+        except asyncio.TimeoutError:
             await ctx.send("The roast service is taking too long to respond. Please try again later.")
-        except requests.exceptions.RequestException as e:
+        except aiohttp.ClientError as e:
             await ctx.send("Failed to fetch roasts. Please try again later.")
             print(f"Evil Insult API error: {e}")
-        except (json.JSONDecodeError, KeyError) as e:
+        except (orjson.JSONDecodeError, KeyError) as e:
             await ctx.send("Received an invalid response from the roast service.")
             print(f"Evil Insult API response error: {e}")
             
 
+    async def cog_command_error(self, ctx, error):
+        if isinstance(error, commands.CheckFailure):
+            await ctx.send("Sorry, the GIF search service is not configured. (Missing API Key)")
+
     @commands.command(name='gif', aliases=['g'])
+    @commands.check(lambda ctx: ctx.cog.tenor_api_key is not None)
     async def gif(self, ctx, *, search_term):
         """Search and send a random GIF.
 
@@ -243,10 +360,6 @@ class FunCog(commands.Cog):
             !gif cute cats
             !g happy dance
         """
-        if not self.tenor_api_key:
-            await ctx.send("Sorry, the GIF search service is not configured. (Missing API Key)")
-            return
-
         if not search_term:
             await ctx.send("Please provide a search term for the GIF. Example: `!gif dancing`")
             return
@@ -256,43 +369,47 @@ class FunCog(commands.Cog):
             "key": self.tenor_api_key,
             "client_key": "my_discord_bot_v1", # Recommended by Tenor for identification
             "limit": 20,  # Number of GIFs to fetch (we'll pick one randomly)
-            "media_filter": "minimal", # To get GIF URLs directly, can also use basic, etc.
+            "media_filter": "tinygif", # One guaranteed response shape, smaller payloads than full gif
             "contentfilter": "medium" # Safety filter: high, medium, low, off
         }
 
         try:
-            response = requests.get(self.tenor_search_url, params=params, timeout=10)
-            response.raise_for_status()  # Raise an exception for HTTP errors (4xx or 5xx)
-            data = response.json()
-
-            if data.get("results") and len(data["results"]) > 0:
-                gif_choice = random.choice(data["results"])
-                # The URL for the actual GIF is usually in media_formats -> gif -> url
-                # Or sometimes a direct URL under a .url or .itemurl key for simpler formats
-                # For minimal filter, it's often under `url` for the result object
-                # or in media_formats -> gif -> url
-                gif_url = gif_choice.get('url') # Direct URL if available from "minimal" filter
-                if not gif_url and 'media_formats' in gif_choice and 'gif' in gif_choice['media_formats']:
-                     gif_url = gif_choice['media_formats']['gif'].get('url')
-                
-                if gif_url:
-                    await ctx.send(gif_url)
-                else:
-                    await ctx.send(f"Sorry, I found GIFs but couldn't get a valid URL for '{search_term}'.")
-                    print(f"Tenor API response for '{search_term}' missing expected GIF URL structure: {gif_choice}")
+            # Serve repeated searches from the persistent per-term cache; it
+            # survives restarts, so a warm query never re-hits Tenor.
+            cache_key = search_term.lower().strip()
+            urls = self.gif_cache.get(cache_key, ttl=self.GIF_CACHE_TTL)
+            if urls is None:
+                async with self.tenor_limiter, self.http.get(self.tenor_search_url, params=params,
+                                                              limiter=self.tenor_limiter) as response:
+                    response.raise_for_status()  # Raise an exception for HTTP errors (4xx or 5xx)
+                    data = orjson.loads(await response.read())
+
+                urls = []
+                for gif_choice in data.get("results") or []:
+                    # media_filter=tinygif pins the response to exactly this
+                    # shape, so no fallback probing is needed
+                    try:
+                        urls.append(gif_choice["media_formats"]["tinygif"]["url"])
+                    except KeyError:
+                        continue
+                if urls:
+                    self.gif_cache.set(cache_key, urls)
+
+            if urls:
+                await ctx.send(random.choice(urls))
             else:
                 await ctx.send(f"Sorry, I couldn't find any GIFs for '{search_term}'.")
 
-        except requests.exceptions.Timeout:
+        except asyncio.TimeoutError:
             await ctx.send("The GIF search request timed out. Please try again later.")
             print("Tenor API request timed out.")
-        except requests.exceptions.HTTPError as e:
+        except aiohttp.ClientResponseError as e:
             await ctx.send(f"An HTTP error occurred with the GIF service. Please try again later.")
-            print(f"Tenor API HTTPError: {e} - Response: {e.response.text if e.response else 'No response'}")
-        except requests.exceptions.RequestException as e:
+            print(f"Tenor API HTTP error: {e.status} {e.message}")
+        except aiohttp.ClientError as e:
             await ctx.send("An error occurred while trying to reach the GIF service.")
-            print(f"Tenor API RequestException: {e}")
-        except json.JSONDecodeError as e:
+            print(f"Tenor API client error: {e}")
+        except orjson.JSONDecodeError as e:
             await ctx.send("There was an issue processing the GIF search results.")
             print(f"Tenor API JSONDecodeError: {e}")
         except Exception as e:
@@ -1,51 +1,35 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
+import aiohttp
+import collections
+import functools
+import logging
 import random
-import requests # For HTTP requests to Gemini and old API
 import json     # For parsing JSON responses
 import os       # To load environment variables
 import re
 import asyncio  # For async/await operations
 
-class TruthOrDareGame:
-    def __init__(self, ctx):
-        self.ctx = ctx
-        self.players = []
-        self.current_player_index = 0
-        self.is_active = False
-        
-    def add_player(self, player):
-        if player not in self.players:
-            self.players.append(player)
-            return True
-        return False
-        
-    def remove_player(self, player):
-        if player in self.players:
-            self.players.remove(player)
-            return True
-        return False
-        
-    def next_player(self):
-        if len(self.players) == 0:
-            return None
-        self.current_player_index = (self.current_player_index + 1) % len(self.players)
-        return self.players[self.current_player_index]
-        
-    def current_player(self):
-        if len(self.players) == 0:
-            return None
-        return self.players[self.current_player_index]
+from utils.cache import JsonFileCache
 
-class GamesCog(commands.Cog):
-    def __init__(self, bot):
-        self.bot = bot
-        self.hangman_games = {}  # Stores active hangman games {channel_id: game_state}
-        self.active_tod_games = {}
-        self.fallback_word_list = ["python", "discord", "hangman", "bot", "developer", "coding", "cascade", "paradigm", "magic", "wizard", "google", "gemini"]
-        # Hangman drawing stages (simple text based)
-        self.hangman_stages = [
-            r""" 
+# Dice notation: (num_dice)d(num_sides)(+/-modifier), e.g. d6, 2d10, d20+5, 3d8-2.
+# Compiled once at import instead of on every !roll.
+_DICE_RE = re.compile(r"^(?:(\d+)?[dD])?(\d+)(?:([+-])(\d+))?$", re.IGNORECASE)
+
+_COIN_FACES = ("Heads", "Tails")
+
+# Static embed skeletons: copying a dict into Embed.from_dict is cheaper than
+# rebuilding the embed with add_field/set_footer calls every round.
+_NHIE_QUESTION_TEMPLATE = {
+    "title": "🙈 Never Have I Ever...",
+    "color": discord.Color.purple().value,
+    "footer": {"text": "Results will be shown in 30 seconds..."},
+}
+_NHIE_RESULT_TEMPLATE = {"title": "Results"}
+
+# Hangman drawing stages (simple text based), shared by every game.
+HANGMAN_STAGES = (
+    r""" 
             --------
             |      |
             |      O
@@ -54,7 +38,7 @@ class GamesCog(commands.Cog):
             |     / \
             --------
             """,
-            r"""
+    r"""
             --------
             |      |
             |      O
@@ -63,7 +47,7 @@ class GamesCog(commands.Cog):
             |     /
             --------
             """,
-            r"""
+    r"""
             --------
             |      |
             |      O
@@ -72,7 +56,7 @@ class GamesCog(commands.Cog):
             |
             --------
             """,
-            r"""
+    r"""
             --------
             |      |
             |      O
@@ -81,7 +65,7 @@ class GamesCog(commands.Cog):
             |
             --------
             """,
-            r"""
+    r"""
             --------
             |      |
             |      O
@@ -90,7 +74,7 @@ class GamesCog(commands.Cog):
             |
             --------
             """,
-            r"""
+    r"""
             --------
             |      |
             |      O
@@ -99,7 +83,7 @@ class GamesCog(commands.Cog):
             |
             --------
             """,
-            r"""
+    r"""
             --------
             |      |
             |
@@ -108,7 +92,128 @@ class GamesCog(commands.Cog):
             |
             --------
             """
-        ]
+)
+
+
+def _letter_bit(letter):
+    """Bit for a lowercase ASCII letter: 'a' -> bit 0 ... 'z' -> bit 25."""
+    return 1 << (ord(letter) - 97)
+
+
+def _word_mask(word):
+    mask = 0
+    for letter in word:
+        mask |= _letter_bit(letter)
+    return mask
+
+
+def _mask_letters(mask):
+    """Letters set in a bitmask, already in alphabetical order."""
+    return [chr(97 + i) for i in range(26) if mask & (1 << i)]
+
+
+@functools.lru_cache(maxsize=8)
+def get_hangman_drawing(attempts_left):
+    """Return the drawing for a number of attempts left (memoized: 7 inputs)."""
+    # Attempts map to inverted stage index (6 attempts = stage 6, 0 attempts = stage 0)
+    # attempts_left 6 -> show empty gallows, attempts_left 0 -> full hangman
+    stage_index = max(0, attempts_left) # Ensure index is not negative
+    if stage_index < len(HANGMAN_STAGES):
+        # Invert index because more attempts left means an earlier stage (less drawing)
+        return HANGMAN_STAGES[len(HANGMAN_STAGES) - 1 - stage_index]
+    return HANGMAN_STAGES[0] # Default to full hangman if out of bounds
+
+class TruthOrDareGame:
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.players = []
+        self.current_player_index = 0
+        self.is_active = False
+        
+    def add_player(self, player):
+        if player not in self.players:
+            self.players.append(player)
+            return True
+        return False
+        
+    def remove_player(self, player):
+        if player in self.players:
+            self.players.remove(player)
+            return True
+        return False
+        
+    def next_player(self):
+        if len(self.players) == 0:
+            return None
+        self.current_player_index = (self.current_player_index + 1) % len(self.players)
+        return self.players[self.current_player_index]
+        
+    def current_player(self):
+        if len(self.players) == 0:
+            return None
+        return self.players[self.current_player_index]
+
+
+class TruthDareView(discord.ui.View):
+    """Truth/Dare choice buttons for the current player's turn."""
+
+    def __init__(self, current_player):
+        super().__init__(timeout=30.0)
+        self.value = None
+        self.current_player = current_player
+
+    @discord.ui.button(label='Truth 🤔', style=discord.ButtonStyle.green)
+    async def truth(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if interaction.user != self.current_player:
+            await interaction.response.send_message("This is not your turn!", ephemeral=True)
+            return
+        self.value = 'truth'
+        self.stop()
+        await interaction.response.defer()
+
+    @discord.ui.button(label='Dare 😈', style=discord.ButtonStyle.red)
+    async def dare(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if interaction.user != self.current_player:
+            await interaction.response.send_message("This is not your turn!", ephemeral=True)
+            return
+        self.value = 'dare'
+        self.stop()
+        await interaction.response.defer()
+
+
+class GamesCog(commands.Cog):
+
+    WORD_QUEUE_SIZE = 8      # ready-to-play Hangman words kept on hand
+    WORD_PREFETCH_BATCH = 3  # parallel fetches per refill pass
+    WORD_CACHE_MIN = 200     # bank this many words before serving from cache
+    WORD_CACHE_HIT_P = 0.7   # chance of a cache hit once the bank is full
+    TOD_PREFETCH = 4         # truth/dare questions buffered per kind per game
+    TOD_LOW_WATER = 2        # refill a game's question queue below this
+    NHIE_POOL_LOW = 10       # refill the shared NHIE statement pool below this
+    NHIE_REFILL_BATCH = 10
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.log = logging.getLogger("games")
+        self.session = None  # aiohttp.ClientSession, created in cog_load
+        self.word_queue = asyncio.Queue(maxsize=self.WORD_QUEUE_SIZE)
+        # Every accepted word is banked on disk; once the bank is big enough
+        # most games never touch the network and survive API outages.
+        self.word_cache = JsonFileCache("cache/hangman_words.json", max_entries=4)
+        self._known_words = set(self.word_cache.get("words") or [])
+        self.hangman_games = {}  # Stores active hangman games {channel_id: game_state}
+        # Per-channel locks so spammed commands can't race duplicate API calls
+        self._channel_locks = collections.defaultdict(asyncio.Lock)
+        self.active_tod_games = {}
+        # channel_id -> {'truth': Queue, 'dare': Queue}; filled in the
+        # background so each turn serves its question without a network wait
+        self.question_cache = {}
+        self.nhie_polls = {}  # message_id -> set of user ids who reacted ✅
+        # Statements are interchangeable across rounds and guilds, so one
+        # shared pool absorbs bursts of !nhie without per-round fetches
+        self._nhie_pool = collections.deque(maxlen=50)
+        self._nhie_refilling = False
+        self.fallback_word_list = ["python", "discord", "hangman", "bot", "developer", "coding", "cascade", "paradigm", "magic", "wizard", "google", "gemini"]
         
         self.gemini_api_key = os.getenv("GEMINI_API_KEY")
         self.gemini_api_url = None
@@ -116,11 +221,119 @@ class GamesCog(commands.Cog):
             # Using gemini-1.5-flash as it's often good for quick, specific text generation tasks.
             # You can change to gemini-pro or other models if preferred.
             self.gemini_api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={self.gemini_api_key}"
+            # SSE streaming variant: lets us stop reading as soon as the word arrives
+            self.gemini_stream_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:streamGenerateContent?alt=sse&key={self.gemini_api_key}"
         else:
-            print("GEMINI_API_KEY not found in .env. Hangman will rely on fallback list or secondary API.")
+            self.log.warning("GEMINI_API_KEY not found in .env. Hangman will rely on fallback list or secondary API.")
+
+    async def cog_load(self):
+        # Bot-wide pooled session (owned by main), shared across all cogs
+        self.session = self.bot.http_session
+        self.prefetch_words.start()
+
+    async def cog_command_error(self, ctx, error):
+        if isinstance(error, commands.CommandOnCooldown):
+            await ctx.send(f"⏳ Slow down! Try again in {error.retry_after:.1f} seconds.")
+
+    async def cog_unload(self):
+        self.prefetch_words.cancel()
+
+    @tasks.loop(seconds=30)
+    async def prefetch_words(self):
+        """Keep a buffer of Hangman words so !hangman starts instantly."""
+        missing = self.WORD_QUEUE_SIZE - self.word_queue.qsize()
+        if missing <= 0:
+            return
+        results = await asyncio.gather(
+            *[self._get_random_word() for _ in range(min(missing, self.WORD_PREFETCH_BATCH))],
+            return_exceptions=True
+        )
+        for word in results:
+            if not isinstance(word, str) or not word:
+                continue
+            try:
+                self.word_queue.put_nowait(word)
+            except asyncio.QueueFull:
+                break
+
+    @prefetch_words.before_loop
+    async def before_prefetch_words(self):
+        await self.bot.wait_until_ready()
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload):
+        # The gateway already pushes every reaction, so NHIE polls tally
+        # in-memory instead of re-fetching the message and paginating users
+        voters = self.nhie_polls.get(payload.message_id)
+        if voters is None or str(payload.emoji) != '✅':
+            return
+        if payload.member is not None and payload.member.bot:
+            return
+        voters.add(payload.user_id)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_remove(self, payload):
+        # Mirror of the add listener: retracting the ✅ before the countdown
+        # ends takes the voter back out of the tally
+        voters = self.nhie_polls.get(payload.message_id)
+        if voters is not None and str(payload.emoji) == '✅':
+            voters.discard(payload.user_id)
+
+    async def _refill_nhie_pool(self):
+        if self._nhie_refilling:
+            return
+        self._nhie_refilling = True
+        try:
+            results = await asyncio.gather(
+                *[self._fetch_tod_question('nhie', rating='pg13') for _ in range(self.NHIE_REFILL_BATCH)],
+                return_exceptions=True
+            )
+            self._nhie_pool.extend(r for r in results if not isinstance(r, BaseException))
+        finally:
+            self._nhie_refilling = False
+
+    def _tod_msg_check(self, channel_id, author_id, msg):
+        return (msg.channel.id == channel_id and msg.author.id == author_id
+                and msg.content.lower() == "!done")
+
+    def _tod_skip_check(self, channel_id, author_id, reaction, user):
+        return (user.id == author_id and str(reaction.emoji) == '⏭️'
+                and reaction.message.channel.id == channel_id)
+
+    async def _fetch_tod_question(self, kind, rating='pg'):
+        async with self.session.get(f"https://api.truthordarebot.xyz/v1/{kind}?rating={rating}") as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def _prefill_questions(self, channel_id):
+        """Top up both question queues for a game with parallel fetches."""
+        queues = self.question_cache.get(channel_id)
+        if queues is None:
+            return
+        for kind, queue in queues.items():
+            missing = self.TOD_PREFETCH - queue.qsize()
+            if missing <= 0:
+                continue
+            results = await asyncio.gather(
+                *[self._fetch_tod_question(kind) for _ in range(missing)],
+                return_exceptions=True
+            )
+            for data in results:
+                if not isinstance(data, BaseException):
+                    queue.put_nowait(data)
+
+    def _remember_word(self, word):
+        """Bank an accepted word; persists only when the word is new."""
+        if word not in self._known_words:
+            self._known_words.add(word)
+            self.word_cache.set("words", sorted(self._known_words))
 
     async def _get_random_word(self):
-        """Fetches a random word, prioritizing Gemini (HTTP), then old API, then fallback list."""
+        """Fetches a random word, prioritizing the word bank, then Gemini (HTTP), then old API, then fallback list."""
+        # 0. Usually serve from the banked words once enough have accumulated
+        if len(self._known_words) > self.WORD_CACHE_MIN and random.random() < self.WORD_CACHE_HIT_P:
+            return random.choice(tuple(self._known_words))
+
         # 1. Try Gemini API (HTTP)
         if self.gemini_api_url:
             prompt = ("Provide a single, common, lowercase English word between 5 and 10 letters long, suitable for a game of Hangman. "
@@ -137,81 +350,77 @@ class GamesCog(commands.Cog):
                 }
             }
 
-            try:
-                # Note: requests.post is synchronous. For a truly async call here in an async function,
-                # you'd typically use a library like httpx. For simplicity with current dependencies,
-                # we'll use requests.post. If this causes blocking issues, consider httpx.
-                response = requests.post(self.gemini_api_url, headers=headers, data=json.dumps(payload), timeout=10) # 10 second timeout
-                response.raise_for_status() # Raise an exception for HTTP errors (4xx or 5xx)
-                
-                result = response.json()
-                if result and 'candidates' in result and result['candidates']:
-                    candidate = result['candidates'][0]
-                    if 'content' in candidate and 'parts' in candidate['content'] and candidate['content']['parts']:
-                        word = candidate['content']['parts'][0]['text'].strip().lower()
-                        # Basic validation
-                        if ' ' not in word and word.isalpha() and 5 <= len(word) <= 10:
-                            print(f"Gemini API (HTTP) word: {word}")
-                            return word
-                        else:
-                            print(f"Gemini API (HTTP) returned an unsuitable word: {word}")
-                    else:
-                        print("Gemini API (HTTP) response missing content parts.")
-                else:
-                    print("Gemini API (HTTP) response missing candidates.")
-            except requests.exceptions.Timeout:
-                print("Gemini API (HTTP) request timed out.")
-            except requests.exceptions.RequestException as e:
-                print(f"Error calling Gemini API (HTTP): {e} - Response: {e.response.text if e.response else 'No response'}")
-            except json.JSONDecodeError as e:
-                print(f"Error decoding JSON from Gemini API (HTTP): {e}")
-            except Exception as e:
-                print(f"An unexpected error occurred with Gemini API (HTTP): {e}")
+            # Fail fast: a 3s budget per attempt with one short-backoff retry
+            # recovers most transient errors, and a slow Gemini drops to the
+            # secondary API quickly instead of stalling the game for 10s.
+            for attempt in range(2):
+                try:
+                    async with self.session.post(self.gemini_stream_url, headers=headers, json=payload,
+                                                 timeout=aiohttp.ClientTimeout(total=3)) as response:
+                        response.raise_for_status() # Raise an exception for HTTP errors (4xx or 5xx)
+                        buffer = ""
+                        async for raw_line in response.content:
+                            line = raw_line.strip()
+                            if not line.startswith(b"data:"):
+                                continue
+                            try:
+                                chunk = json.loads(line[5:])
+                                candidate = chunk['candidates'][0]
+                                buffer += candidate['content']['parts'][0]['text']
+                            except (json.JSONDecodeError, KeyError, IndexError):
+                                continue
+                            if not candidate.get('finishReason'):
+                                continue
+                            # Generation is complete: validate and bail out without
+                            # draining any trailing usage-metadata events.
+                            word = buffer.strip().lower()
+                            if ' ' not in word and word.isalpha() and 5 <= len(word) <= 10:
+                                self.log.info("Gemini API (HTTP) word: %s", word)
+                                self._remember_word(word)
+                                return word
+                            self.log.info("Gemini API (HTTP) returned an unsuitable word: %s", word)
+                            break
+                    break  # got a response; an unsuitable word isn't worth a retry
+                except asyncio.TimeoutError:
+                    self.log.warning("Gemini API (HTTP) request timed out.")
+                except aiohttp.ClientError as e:
+                    self.log.warning("Error calling Gemini API (HTTP): %s", e)
+                except Exception as e:
+                    self.log.exception("An unexpected error occurred with Gemini API (HTTP): %s", e)
+                    break
+                if attempt == 0:
+                    await asyncio.sleep(0.2 * (2 ** attempt))
         else:
-            print("Gemini API (HTTP) URL not configured.")
+            self.log.debug("Gemini API (HTTP) URL not configured.")
 
         # 2. Try old random word API (as a secondary option)
         try:
-            response = requests.get("https://random-word-api.herokuapp.com/word", timeout=5) # 5 second timeout
-            response.raise_for_status()
-            word_data = response.json()
+            async with self.session.get("https://random-word-api.herokuapp.com/word",
+                                        timeout=aiohttp.ClientTimeout(total=5)) as response:
+                response.raise_for_status()
+                word_data = await response.json()
             if word_data and isinstance(word_data, list) and len(word_data) > 0:
                 api_word = word_data[0].lower()
                 if api_word.isalpha() and 3 <= len(api_word) <= 12:
-                    print(f"Using word from random-word-api: {api_word}")
+                    self.log.info("Using word from random-word-api: %s", api_word)
+                    self._remember_word(api_word)
                     return api_word
-        except requests.exceptions.Timeout:
-            print("Old random word API request timed out.")
+        except asyncio.TimeoutError:
+            self.log.warning("Old random word API request timed out.")
         except Exception as e:
-            print(f"Old random word API failed: {e}")
+            self.log.warning("Old random word API failed: %s", e)
 
         # 3. Fallback to local list
         fallback_word = random.choice(self.fallback_word_list)
-        print(f"Using fallback word: {fallback_word}")
+        self.log.info("Using fallback word: %s", fallback_word)
         return fallback_word
 
-    def generate_hangman_display(self, word, guessed_letters):
-        display = ""
-        for letter in word:
-            if letter in guessed_letters:
-                display += letter + " "
-            else:
-                display += "_ "
-        return display.strip()
-
-    def get_hangman_drawing(self, attempts_left):
-        # Attempts map to inverted stage index (6 attempts = stage 6, 0 attempts = stage 0)
-        # Max attempts is 6, so 6 stages + initial empty stage (not used here)
-        # if stages are 0 (full hangman) to 6 (empty gallows)
-        # attempts_left 6 -> show empty (or almost empty)
-        # attempts_left 0 -> show full hangman (index 0 of self.hangman_stages)
-        stage_index = max(0, attempts_left) # Ensure index is not negative
-        if stage_index < len(self.hangman_stages):
-             # Invert index because more attempts left means an earlier stage (less drawing)
-            return self.hangman_stages[len(self.hangman_stages) - 1 - stage_index]
-        return self.hangman_stages[0] # Default to full hangman if out of bounds
+    def generate_hangman_display(self, word, guessed_mask):
+        # Single-allocation join instead of repeated string concatenation
+        return " ".join(c if guessed_mask & _letter_bit(c) else "_" for c in word)
 
     @commands.command(name='hangman', aliases=['hg'])
+    @commands.cooldown(1, 5, commands.BucketType.channel)
     async def hangman_start(self, ctx):
         """Play Hangman - Guess the Word!
 
@@ -246,22 +455,34 @@ class GamesCog(commands.Cog):
             await ctx.send("A Hangman game is already in progress in this channel! Use `!guess <letter>` or `!hstop` to stop.")
             return
 
-        chosen_word = await self._get_random_word()
+        # Prefer a prefetched word (instant); fall back to a live fetch only
+        # when the buffer is empty. The lock stops a burst of !hangman in one
+        # channel from firing several concurrent Gemini calls.
+        async with self._channel_locks[channel_id]:
+            if channel_id in self.hangman_games:
+                return
+            try:
+                chosen_word = self.word_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                chosen_word = await self._get_random_word()
         if not chosen_word:
             await ctx.send("Sorry, I couldn't fetch a random word to start the game. Please try again later.")
             return
         
         self.hangman_games[channel_id] = {
             "word": chosen_word,
-            "guessed_letters": set(),
-            "incorrect_guesses": set(), # Keep track of wrong letters too
+            # Letter state lives in 26-bit masks: membership, union and the
+            # win check are single bitwise ops instead of set probes
+            "unique_mask": _word_mask(chosen_word),  # precomputed win target
+            "guessed_mask": 0,
+            "incorrect_mask": 0, # Keep track of wrong letters too
             "attempts_left": 6, 
             "host": ctx.author.id 
         }
 
         game_state = self.hangman_games[channel_id]
-        display_word = self.generate_hangman_display(chosen_word, game_state["guessed_letters"])
-        drawing = self.get_hangman_drawing(game_state["attempts_left"])
+        display_word = self.generate_hangman_display(chosen_word, game_state["guessed_mask"])
+        drawing = get_hangman_drawing(game_state["attempts_left"])
         
         embed = discord.Embed(title="Hangman Game Started!", description=f"```{drawing}```", color=discord.Color.blue())
         embed.add_field(name="Word", value=f"`{display_word}`", inline=False)
@@ -309,42 +530,43 @@ class GamesCog(commands.Cog):
             await ctx.send("Invalid guess. Please enter a single letter.")
             return
 
-        if guess in game_state["guessed_letters"] or guess in game_state["incorrect_guesses"]:
+        guess_bit = _letter_bit(guess)
+        if (game_state["guessed_mask"] | game_state["incorrect_mask"]) & guess_bit:
             await ctx.send(f"You've already guessed the letter '{guess}'. Try a different one.")
             return
 
         message = ""
         if guess in word_to_guess:
-            game_state["guessed_letters"].add(guess)
+            game_state["guessed_mask"] |= guess_bit
             message = f"Good guess! '{guess}' is in the word."
-            # Check for win
-            if all(char in game_state["guessed_letters"] for char in word_to_guess):
-                drawing = self.get_hangman_drawing(game_state["attempts_left"])
+            # Check for win: every word letter's bit is covered by guesses
+            if not (game_state["unique_mask"] & ~game_state["guessed_mask"]):
+                drawing = get_hangman_drawing(game_state["attempts_left"])
                 embed = discord.Embed(title="🎉 You Won! 🎉", description=f"```{drawing}```", color=discord.Color.green())
                 embed.add_field(name="Word", value=f"`{word_to_guess.upper()}`", inline=False)
                 embed.add_field(name="Guessed by", value=ctx.author.mention, inline=False)
                 embed.set_footer(text="Game Over. Play again with !hangman")
                 await ctx.send(embed=embed)
-                del self.hangman_games[channel_id]
+                self.hangman_games.pop(channel_id, None)
                 return
         else:
-            game_state["incorrect_guesses"].add(guess)
+            game_state["incorrect_mask"] |= guess_bit
             game_state["attempts_left"] -= 1
             message = f"Sorry, '{guess}' is not in the word."
             # Check for loss
             if game_state["attempts_left"] == 0:
-                drawing = self.get_hangman_drawing(game_state["attempts_left"])
+                drawing = get_hangman_drawing(game_state["attempts_left"])
                 embed = discord.Embed(title="💀 You Lost! 💀", description=f"```{drawing}```", color=discord.Color.red())
                 embed.add_field(name="The word was", value=f"`{word_to_guess.upper()}`", inline=False)
                 embed.set_footer(text="Game Over. Play again with !hangman")
                 await ctx.send(embed=embed)
-                del self.hangman_games[channel_id]
+                self.hangman_games.pop(channel_id, None)
                 return
 
         # Send update message
-        display_word = self.generate_hangman_display(word_to_guess, game_state["guessed_letters"])
-        drawing = self.get_hangman_drawing(game_state["attempts_left"])
-        guessed_so_far = ", ".join(sorted(list(game_state["guessed_letters"].union(game_state["incorrect_guesses"])))) or "None yet"
+        display_word = self.generate_hangman_display(word_to_guess, game_state["guessed_mask"])
+        drawing = get_hangman_drawing(game_state["attempts_left"])
+        guessed_so_far = ", ".join(_mask_letters(game_state["guessed_mask"] | game_state["incorrect_mask"])) or "None yet"
 
         embed = discord.Embed(title="Hangman Update", description=f"```{drawing}```\n{message}", color=discord.Color.blue())
         embed.add_field(name="Word", value=f"`{display_word}`", inline=False)
@@ -383,7 +605,7 @@ class GamesCog(commands.Cog):
             return
 
         word_was = game_state["word"]
-        del self.hangman_games[channel_id]
+        self.hangman_games.pop(channel_id, None)
         await ctx.send(f"Hangman game stopped by {ctx.author.mention}. The word was: `{word_was.upper()}`")
 
     @commands.command(name='roll', aliases=['dice'])
@@ -405,10 +627,7 @@ class GamesCog(commands.Cog):
             !roll 1d10+3 - Roll a 10-sided die and add 3
             !roll 3d8-2 - Roll three 8-sided dice and subtract 2
         """
-        # Regex to parse dice notation: (num_dice)d(num_sides)(+/-modifier_value)
-        # Examples: d6, 2d10, d20+5, 3d8-2
-        pattern = re.compile(r"^(?:(\d+)?[dD])?(\d+)(?:([+-])(\d+))?$", re.IGNORECASE)
-        match = pattern.match(dice_notation.strip())
+        match = _DICE_RE.match(dice_notation.strip())
 
         if not match:
             await ctx.send(f"Invalid dice notation: `{dice_notation}`. Examples: `d6`, `2d10`, `d20+5`.")
@@ -444,7 +663,9 @@ class GamesCog(commands.Cog):
             return
         # Optional: Modifier limit if desired (e.g., +/- 1000)
 
-        rolls = [random.randint(1, num_sides) for _ in range(num_dice)]
+        # random.choices draws all dice in one C-level call instead of a
+        # Python loop of randint invocations
+        rolls = random.choices(range(1, num_sides + 1), k=num_dice)
         total_sum = sum(rolls) + modifier
 
         original_input_notation = dice_notation.strip()
@@ -482,7 +703,9 @@ class GamesCog(commands.Cog):
             !flip - Flip a coin and see heads/tails
             !toss - Same as !flip
         """
-        result = random.choice(["Heads", "Tails"])
+        # Index a constant tuple with one random bit instead of building a
+        # fresh list for random.choice each flip
+        result = _COIN_FACES[random.getrandbits(1)]
         emoji = "🪙" 
         await ctx.send(f"{ctx.author.mention} flipped a coin and got: **{result}** {emoji}")
 
@@ -529,6 +752,9 @@ class GamesCog(commands.Cog):
         game.is_active = True
         game.add_player(ctx.author)
         self.active_tod_games[ctx.channel.id] = game
+        # Warm the question queues while players are still joining
+        self.question_cache[ctx.channel.id] = {'truth': asyncio.Queue(), 'dare': asyncio.Queue()}
+        asyncio.create_task(self._prefill_questions(ctx.channel.id))
 
         await ctx.send(f"🎮 {ctx.author.mention} has started a new Truth or Dare game!\n"
                       "Others can join using `!tod join`\n"
@@ -572,7 +798,8 @@ class GamesCog(commands.Cog):
         if game.remove_player(ctx.author):
             await ctx.send(f"👋 {ctx.author.mention} has left the game!")
             if len(game.players) == 0:
-                del self.active_tod_games[ctx.channel.id]
+                self.active_tod_games.pop(ctx.channel.id, None)
+                self.question_cache.pop(ctx.channel.id, None)
                 await ctx.send("Game ended as there are no more players!")
         else:
             await ctx.send(f"❌ {ctx.author.mention}, you're not in the game!")
@@ -600,9 +827,9 @@ class GamesCog(commands.Cog):
         game.is_active = False
         
         # Remove the game from active games
-        if ctx.channel.id in self.active_tod_games:
-            del self.active_tod_games[ctx.channel.id]
-            
+        self.active_tod_games.pop(ctx.channel.id, None)
+        self.question_cache.pop(ctx.channel.id, None)
+
         await ctx.send("🎮 Truth or Dare game has been ended!")
 
     @truth_or_dare.command(name='players', brief="See who's playing Truth or Dare")
@@ -644,31 +871,6 @@ class GamesCog(commands.Cog):
             await ctx.send("❌ Need at least 2 players to play! Others can join with `!tod join`")
             return
 
-        # Create buttons for Truth or Dare choice
-        class TruthDareView(discord.ui.View):
-            def __init__(self, current_player):
-                super().__init__(timeout=30.0)
-                self.value = None
-                self.current_player = current_player
-
-            @discord.ui.button(label='Truth 🤔', style=discord.ButtonStyle.green)
-            async def truth(self, interaction: discord.Interaction, button: discord.ui.Button):
-                if interaction.user != self.current_player:
-                    await interaction.response.send_message("This is not your turn!", ephemeral=True)
-                    return
-                self.value = 'truth'
-                self.stop()
-                await interaction.response.defer()
-
-            @discord.ui.button(label='Dare 😈', style=discord.ButtonStyle.red)
-            async def dare(self, interaction: discord.Interaction, button: discord.ui.Button):
-                if interaction.user != self.current_player:
-                    await interaction.response.send_message("This is not your turn!", ephemeral=True)
-                    return
-                self.value = 'dare'
-                self.stop()
-                await interaction.response.defer()
-
         while ctx.channel.id in self.active_tod_games and game.is_active and len(game.players) >= 2:
             current_player = game.current_player()
             if current_player not in game.players:  # In case player left mid-game
@@ -702,51 +904,74 @@ class GamesCog(commands.Cog):
 
                 # Get truth or dare question from API
                 try:
-                    response = requests.get(
-                        f"https://api.truthordarebot.xyz/v1/{view.value}?rating=pg",
-                        timeout=10
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-                    
+                    queues = self.question_cache.get(ctx.channel.id)
+                    queue = queues[view.value] if queues else None
+                    if queue is not None and not queue.empty():
+                        data = queue.get_nowait()
+                    else:
+                        # Lock per channel so a double-fired choice can't request
+                        # two questions for the same turn
+                        async with self._channel_locks[ctx.channel.id], self.session.get(
+                            f"https://api.truthordarebot.xyz/v1/{view.value}?rating=pg"
+                        ) as response:
+                            response.raise_for_status()
+                            data = await response.json()
+                    if queue is not None and queue.qsize() < self.TOD_LOW_WATER:
+                        asyncio.create_task(self._prefill_questions(ctx.channel.id))
+
                     # Send the question/challenge
                     emoji = "🤔" if view.value == 'truth' else "😈"
                     await ctx.send(f"{emoji} {current_player.mention}: {data['question']}")
                     
                     # Wait for player to complete
-                    await ctx.send("Type `!done` when you've completed your truth/dare!")
-                    
-                    def check(m):
-                        return m.author == current_player and m.content.lower() == "!done" and m.channel == ctx.channel
-                    
-                    try:
-                        done_msg = await self.bot.wait_for('message', timeout=300.0, check=check)
+                    await ctx.send("Type `!done` when you've completed your truth/dare, or react with ⏭️ to skip!")
+
+                    # Bind the shared check methods instead of allocating two
+                    # fresh closures per turn
+                    check = functools.partial(self._tod_msg_check, ctx.channel.id, current_player.id)
+                    skip_check = functools.partial(self._tod_skip_check, ctx.channel.id, current_player.id)
+
+                    # One multiplexed waiter for both completion signals; the
+                    # loser is cancelled instead of idling out its timeout
+                    msg_task = asyncio.create_task(self.bot.wait_for('message', check=check))
+                    skip_task = asyncio.create_task(self.bot.wait_for('reaction_add', check=skip_check))
+                    done, pending = await asyncio.wait(
+                        {msg_task, skip_task}, timeout=300.0, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in pending:
+                        task.cancel()
+
+                    if not done:
+                        await ctx.send(f"❌ {current_player.mention} took too long to complete their {view.value}! Skipping...")
+                    elif msg_task in done:
+                        done_msg = msg_task.result()
                         try:
                             await done_msg.delete()
                         except:
                             pass
                         await ctx.send(f"✅ {current_player.mention} has completed their {view.value}!")
-                    except asyncio.TimeoutError:
-                        await ctx.send(f"❌ {current_player.mention} took too long to complete their {view.value}! Skipping...")
+                    else:
+                        await ctx.send(f"⏭️ {current_player.mention} skipped their {view.value}!")
                     
-                except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+                except (aiohttp.ClientError, asyncio.TimeoutError, json.JSONDecodeError) as e:
                     await ctx.send("❌ Failed to get a question. Skipping this turn...")
-                    print(f"Truth or Dare API error: {e}")
+                    self.log.warning("Truth or Dare API error: %s", e)
                 
                 # Move to next player
                 game.next_player()
-                
-                # Add a small delay between turns
-                await asyncio.sleep(2)
+
+                # The small delay between turns doubles as cover for topping
+                # up the question queues, so the next turn's fetch is free
+                await asyncio.gather(asyncio.sleep(2), self._prefill_questions(ctx.channel.id))
                 
             except discord.NotFound:
                 # Message was deleted or channel is gone
                 return
             except Exception as e:
-                print(f"Error in Truth or Dare game: {e}")
+                self.log.exception("Error in Truth or Dare game: %s", e)
                 await ctx.send("❌ An error occurred. The game has been ended.")
-                if ctx.channel.id in self.active_tod_games:
-                    del self.active_tod_games[ctx.channel.id]
+                self.active_tod_games.pop(ctx.channel.id, None)
+                self.question_cache.pop(ctx.channel.id, None)
                 return
 
     @commands.command(name='nhie', aliases=['neverhaveiever'])
@@ -775,71 +1000,74 @@ class GamesCog(commands.Cog):
             !neverhaveiever - Same as !nhie
         """
         try:
-            response = requests.get("https://api.truthordarebot.xyz/v1/nhie?rating=pg13", timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            if self._nhie_pool:
+                data = self._nhie_pool.popleft()
+            else:
+                async with self.session.get("https://api.truthordarebot.xyz/v1/nhie?rating=pg13") as response:
+                    response.raise_for_status()
+                    data = await response.json()
+            if len(self._nhie_pool) < self.NHIE_POOL_LOW:
+                asyncio.create_task(self._refill_nhie_pool())
             
             # Create and send the message with the statement
-            embed = discord.Embed(
-                title="🙈 Never Have I Ever...",
-                description=f"{data['question']}\n\n**React with ✅ below if you have done this!**",
-                color=discord.Color.purple()
-            )
-            embed.set_footer(text="Results will be shown in 30 seconds...")
-            
+            embed = discord.Embed.from_dict({
+                **_NHIE_QUESTION_TEMPLATE,
+                "description": f"{data['question']}\n\n**React with ✅ below if you have done this!**",
+            })
+
             message = await ctx.send(embed=embed)
-            
-            # Countdown timer (30 seconds)
-            countdown_msg = await ctx.send("Time remaining: 30 seconds")
-            for i in range(25, 0, -5):  # Update every 5 seconds
+            self.nhie_polls[message.id] = set()
+
+            try:
+                # Countdown timer (30 seconds): two edits instead of ~11, since
+                # every edit is a REST call against the channel's rate-limit bucket
+                countdown_msg = await ctx.send("Time remaining: 30 seconds")
+                await asyncio.sleep(25)
+                await countdown_msg.edit(content="Time remaining: 5 seconds")
                 await asyncio.sleep(5)
-                await countdown_msg.edit(content=f"Time remaining: {i} seconds")
-            
-            # Final 5 seconds countdown
-            for i in range(5, 0, -1):  # Update every second for last 5 seconds
+                await countdown_msg.edit(content="Time's up! Tallying results...")
                 await asyncio.sleep(1)
-                await countdown_msg.edit(content=f"Time remaining: {i} seconds")
-            
-            await countdown_msg.edit(content="Time's up! Tallying results...")
-            await asyncio.sleep(1)
-            await countdown_msg.delete()
-            
-            # Fetch the message again to get updated reactions
-            message = await ctx.channel.fetch_message(message.id)
-            
-            # Count reactions and get users who reacted
-            users = []
-            reaction = discord.utils.get(message.reactions, emoji='✅')
-            if reaction:
-                async for user in reaction.users():
-                    if not user.bot:
-                        users.append(user)
+                await countdown_msg.delete()
+            finally:
+                # Always retire the poll, even if an edit/delete raised, so a
+                # dead round can't keep collecting reactions forever
+                user_ids = self.nhie_polls.pop(message.id, set())
+
+            # Tally from the gateway-fed voter set and resolve names from the
+            # member cache: no message re-fetch, no reaction pagination. In a
+            # DM there is no guild, so fall back to the global user cache.
+            if ctx.guild:
+                users = [member for uid in user_ids
+                         if (member := ctx.guild.get_member(uid)) and not member.bot]
+            else:
+                users = [user for uid in user_ids
+                         if (user := self.bot.get_user(uid)) and not user.bot]
             
             # Create result message
             count = len(users)
             if count == 0:
                 result = "Nobody has done this! 😇"
             else:
-                user_list = ", ".join([user.display_name for user in users])
+                user_list = ", ".join(user.display_name for user in users)
                 result = f"**{count}** {'person has' if count == 1 else 'people have'} done this!"
                 result += f"\n👥 Who did it: {user_list}"
             
             # Send results
-            result_embed = discord.Embed(
-                title="Results",
-                description=result,
-                color=discord.Color.green() if count > 0 else discord.Color.blue()
-            )
+            result_embed = discord.Embed.from_dict({
+                **_NHIE_RESULT_TEMPLATE,
+                "description": result,
+                "color": (discord.Color.green() if count > 0 else discord.Color.blue()).value,
+            })
             await ctx.send(embed=result_embed)
                 
-        except requests.exceptions.Timeout:
+        except asyncio.TimeoutError:
             await ctx.send("The service is taking too long to respond. Please try again later.")
-        except requests.exceptions.RequestException as e:
+        except aiohttp.ClientError as e:
             await ctx.send("Failed to fetch a statement. Please try again later.")
-            print(f"Never Have I Ever API error: {e}")
+            self.log.warning("Never Have I Ever API error: %s", e)
         except Exception as e:
             await ctx.send("An error occurred while running the game.")
-            print(f"Never Have I Ever game error: {e}")
+            self.log.exception("Never Have I Ever game error: %s", e)
 
 async def setup(bot):
     await bot.add_cog(GamesCog(bot))
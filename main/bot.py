@@ -1,5 +1,7 @@
+import aiohttp
 import discord
 from discord.ext import commands
+import orjson
 import os
 import sys # Added for sys.path manipulation
 from dotenv import load_dotenv
@@ -11,7 +13,21 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+from utils.log import setup_queue_logging
+
+# Emoji + display name per cog for the help overview; a dict lookup instead
+# of a chain of string compares on every category.
+_COG_META = {
+    "FunCog": ("🎉", "Fun Commands"),
+    "GamesCog": ("🎮", "Games"),
+    "AICog": ("🤖", "AI Chat"),
+}
+
 async def main():
+    # Non-blocking logging: records are enqueued on the event-loop thread and
+    # written to the stream by a background QueueListener thread.
+    setup_queue_logging()
+
     # Load environment variables from .env file in the project root
     # If running from 'main' dir, dotenv will search upwards or use the explicit path
     load_dotenv(dotenv_path=os.path.join(project_root, '.env'))
@@ -56,6 +72,18 @@ async def main():
             await self.get_destination().send(embed=embed)
 
         async def send_bot_help(self, mapping):
+            # The overview embed only changes when extensions change, so it
+            # is rendered once and reused, keyed by the loaded-cog set. The
+            # cache lives on the bot because discord.py deep-copies the help
+            # command itself on every invocation. The command checks in this
+            # bot are config-presence checks (not per-user), so one entry
+            # suffices.
+            cog_key = tuple(sorted(self.context.bot.cogs))
+            cached = getattr(self.context.bot, '_help_embed_cache', None)
+            if cached and cached[0] == cog_key:
+                await self.get_destination().send(embed=cached[1])
+                return
+
             embed = discord.Embed(
                 title="📖 Bot Commands Guide",
                 description="Here's everything I can do! Use `!help <command>` for more details.\n\u200b",
@@ -70,18 +98,7 @@ async def main():
                 
                 # Get cog name and emoji
                 cog_name = getattr(cog, "qualified_name", "Other")
-                if cog_name == "FunCog":
-                    cog_emoji = "🎉"  # 🎉
-                    cog_display = "Fun Commands"
-                elif cog_name == "GamesCog":
-                    cog_emoji = "🎮"  # 🎮
-                    cog_display = "Games"
-                elif cog_name == "AICog":
-                    cog_emoji = "🤖"  # 🤖
-                    cog_display = "AI Chat"
-                else:
-                    cog_emoji = "⚙️"  # ⚙️
-                    cog_display = cog_name
+                cog_emoji, cog_display = _COG_META.get(cog_name, ("⚙️", cog_name))
 
                 # Add field for each cog
                 command_list = []
@@ -105,6 +122,7 @@ async def main():
                     inline=False
                 )
 
+            self.context.bot._help_embed_cache = (cog_key, embed)
             channel = self.get_destination()
             await channel.send(embed=embed)
 
@@ -145,6 +163,16 @@ async def main():
         help_command=CustomHelpCommand()
     )
 
+    # One pooled session for every cog's outbound API calls, so keep-alive
+    # connections and TLS handshakes amortize across the whole bot instead
+    # of per cog. Cogs pick it up in cog_load; main() owns its lifetime.
+    bot.http_session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=64, ttl_dns_cache=300, keepalive_timeout=60),
+        timeout=aiohttp.ClientTimeout(total=10),
+        headers={"User-Agent": "Functopus"},
+        json_serialize=lambda obj: orjson.dumps(obj).decode()
+    )
+
     @bot.event
     async def on_ready():
         print(f'Logged on as {bot.user}!')
@@ -154,45 +182,52 @@ async def main():
             print(f'- {cog_name}')
         print('------')
 
+    # The guild-join greeting never changes, so build it once; embeds are
+    # serialized fresh on every send, making reuse across guilds safe.
+    welcome_embed = discord.Embed(
+        title="👋 Hello, I'm Functopus, your new Discord Bot!",
+        description="Thanks for adding me to your server!",
+        color=discord.Color.blue()
+    )
+
+    features = (
+        "🎮 **Fun Games**\n"
+        "• Multiplayer Truth or Dare\n"
+        "• Classic Hangman\n"
+        "• Never Have I Ever\n\n"
+        "🤖 **AI Chat**\n"
+        "• Ask me anything\n\n"
+        "😄 **Fun Activities**\n"
+        "• Random Memes\n"
+        "• Compliments\n"
+        "• Roasts\n"
+        "• Jokes\n\n"
+        "🎯 **Getting Started**\n"
+        "• Discover even more activities\n"
+        "• Type `!help` to see all commands\n"
+        "• Use `!help <command>` for detailed info\n"
+    )
+
+    welcome_embed.add_field(
+        name="Features & Commands",
+        value=features,
+        inline=False
+    )
+
+    welcome_embed.set_footer(text="Need help? Type !help for a list of commands!")
+
     @bot.event
     async def on_guild_join(guild):
-        # Find the first text channel we can send messages in
-        channel = next((ch for ch in guild.text_channels if ch.permissions_for(guild.me).send_messages), None)
-        
+        # Prefer the system channel (a free attribute lookup) and only fall
+        # back to scanning every text channel's computed permissions
+        system_channel = guild.system_channel
+        if system_channel and system_channel.permissions_for(guild.me).send_messages:
+            channel = system_channel
+        else:
+            channel = next((ch for ch in guild.text_channels if ch.permissions_for(guild.me).send_messages), None)
+
         if channel:
-            embed = discord.Embed(
-                title="👋 Hello, I'm Functopus, your new Discord Bot!",
-                description="Thanks for adding me to your server!",
-                color=discord.Color.blue()
-            )
-            
-            features = (
-                "🎮 **Fun Games**\n"
-                "• Multiplayer Truth or Dare\n"
-                "• Classic Hangman\n"
-                "• Never Have I Ever\n\n"
-                "🤖 **AI Chat**\n"
-                "• Ask me anything\n\n"
-                "😄 **Fun Activities**\n"
-                "• Random Memes\n"
-                "• Compliments\n"
-                "• Roasts\n"
-                "• Jokes\n\n"
-                "🎯 **Getting Started**\n"
-                "• Discover even more activities\n"
-                "• Type `!help` to see all commands\n"
-                "• Use `!help <command>` for detailed info\n"
-            )
-            
-            embed.add_field(
-                name="Features & Commands",
-                value=features,
-                inline=False
-            )
-            
-            embed.set_footer(text="Need help? Type !help for a list of commands!")
-            
-            await channel.send(embed=embed)
+            await channel.send(embed=welcome_embed)
 
     # Load cogs
     async def load_extensions():
@@ -216,24 +251,37 @@ async def main():
         - AI Chat (ask questions, get help)
         """
         # Cogs directory is now one level up from this script's location
-        cogs_dir = os.path.join(project_root, "cogs") 
-        for filename in os.listdir(cogs_dir):
-            if filename.endswith(".py"):
-                # Construct the module name (e.g., cogs.fun_cog)
-                # The import system will use sys.path to find 'cogs'
-                module_name = f"cogs.{filename[:-3]}"
-                try:
-                    await bot.load_extension(module_name)
-                except Exception as e:
-                    print(f"Failed to load extension {module_name}.")
-                    print(f"[ERROR] {e}")
+        cogs_dir = os.path.join(project_root, "cogs")
+        # The import system will use sys.path to find 'cogs'
+        modules = [f"cogs.{filename[:-3]}"
+                   for filename in os.listdir(cogs_dir) if filename.endswith(".py")]
+        # Load concurrently so startup costs max(load times), not their sum
+        results = await asyncio.gather(
+            *(bot.load_extension(module_name) for module_name in modules),
+            return_exceptions=True
+        )
+        for module_name, result in zip(modules, results):
+            if isinstance(result, Exception):
+                print(f"Failed to load extension {module_name}.")
+                print(f"[ERROR] {result}")
     
     await load_extensions()
-    await bot.start(DISCORD_BOT_TOKEN)
+    try:
+        await bot.start(DISCORD_BOT_TOKEN)
+    finally:
+        await bot.http_session.close()
 
 if __name__ == "__main__":
     # For Windows, the default event loop policy can cause issues with discord.py
     # Setting it to WindowsSelectorEventLoopPolicy can resolve these.
     if os.name == 'nt': # nt is for Windows
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    else:
+        # On POSIX, uvloop's libuv-backed loop is much faster for the
+        # socket-heavy gateway + REST workload; fall back silently if absent.
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass
     asyncio.run(main())
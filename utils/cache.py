@@ -0,0 +1,59 @@
+import os
+import time
+
+import orjson
+
+
+class JsonFileCache:
+    """Small persistent key-value cache backed by a single JSON file.
+
+    Keeps (stored_at, value) entries in insertion order and evicts the
+    least-recently-used entry once max_entries is exceeded, so API results
+    such as GIF URL lists survive bot restarts. Writes go through a temp
+    file plus os.replace so a crash mid-write can't corrupt the cache.
+    """
+
+    def __init__(self, path, max_entries=256):
+        self.path = path
+        self.max_entries = max_entries
+        self._data = {}  # key -> [stored_at, value]
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                self._data = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            self._data = {}
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps(self._data))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[JsonFileCache] Failed to persist {self.path}: {e}")
+
+    def get(self, key, ttl=None):
+        """Return the cached value for key, or None if absent or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if ttl is not None and time.time() - stored_at > ttl:
+            self._data.pop(key, None)
+            return None
+        # Refresh recency so hot keys survive eviction
+        self._data[key] = self._data.pop(key)
+        return value
+
+    def set(self, key, value):
+        self._data.pop(key, None)
+        self._data[key] = [time.time(), value]
+        while len(self._data) > self.max_entries:
+            self._data.pop(next(iter(self._data)))
+        self._save()
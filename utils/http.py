@@ -0,0 +1,93 @@
+import asyncio
+import random
+from urllib.parse import urlsplit
+
+import aiohttp
+
+
+class _AdaptiveRequestContext:
+    """Async context manager so call sites keep the aiohttp `async with` shape."""
+
+    def __init__(self, coro):
+        self._coro = coro
+        self._response = None
+
+    async def __aenter__(self):
+        self._response = await self._coro
+        return self._response
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self._response is not None:
+            self._response.release()
+        return False
+
+
+class AdaptiveRequester:
+    """Retry wrapper around an aiohttp session with congestion-aware backoff.
+
+    Keeps an exponentially weighted moving average of failure signals (429s,
+    5xx and timeouts) per host. Retries sleep for a jittered delay that grows
+    with the observed congestion, so a struggling API gets progressively more
+    breathing room instead of an instant re-request, while healthy hosts
+    retry almost immediately.
+
+    Pass a RateLimiter as the `limiter` keyword to have every attempt's
+    status and headers recorded, including the 429/5xx responses that are
+    retried away before the caller ever sees them.
+    """
+
+    BASE_DELAY = 0.5   # seconds before the first retry on an idle host
+    MAX_ATTEMPTS = 3
+    ALPHA = 0.3        # EWMA smoothing factor for the congestion estimate
+
+    def __init__(self, session):
+        self.session = session
+        self._congestion = {}  # host -> EWMA in [0, 1] of recent failures
+
+    def get(self, url, **kwargs):
+        return _AdaptiveRequestContext(self.request("GET", url, **kwargs))
+
+    def post(self, url, **kwargs):
+        return _AdaptiveRequestContext(self.request("POST", url, **kwargs))
+
+    def congestion(self, host):
+        return self._congestion.get(host, 0.0)
+
+    def _record(self, host, failed):
+        previous = self._congestion.get(host, 0.0)
+        signal = 1.0 if failed else 0.0
+        self._congestion[host] = (1 - self.ALPHA) * previous + self.ALPHA * signal
+
+    async def request(self, method, url, limiter=None, **kwargs):
+        host = urlsplit(url).hostname or url
+        last_error = None
+        for attempt in range(self.MAX_ATTEMPTS):
+            try:
+                response = await self.session.request(method, url, **kwargs)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self._record(host, failed=True)
+                last_error = e
+            else:
+                if limiter is not None:
+                    limiter.record_response(response.status, response.headers)
+                if response.status == 429 or response.status >= 500:
+                    self._record(host, failed=True)
+                    last_error = aiohttp.ClientResponseError(
+                        response.request_info,
+                        response.history,
+                        status=response.status,
+                        message=response.reason or "",
+                        headers=response.headers,
+                    )
+                    response.release()
+                else:
+                    self._record(host, failed=False)
+                    return response
+
+            if attempt < self.MAX_ATTEMPTS - 1:
+                congestion = self._congestion.get(host, 0.0)
+                delay = (self.BASE_DELAY * (2 ** attempt)
+                         * (1 + congestion) * random.uniform(0.5, 1.5))
+                await asyncio.sleep(delay)
+
+        raise last_error
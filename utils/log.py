@@ -0,0 +1,32 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+
+_listener = None
+
+
+def setup_queue_logging(level=logging.INFO):
+    """Route log records through a queue to a background writer thread.
+
+    The event-loop thread only enqueues records (microseconds each); the
+    actual stream writes happen on the QueueListener's thread, so a burst of
+    logging can't stall the bot the way synchronous print() calls can.
+    Safe to call more than once; only the first call installs the handler.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+    atexit.register(_listener.stop)
@@ -0,0 +1,119 @@
+import asyncio
+import collections
+import time
+
+
+class RateLimiter:
+    """Client-side throttle for one external API provider.
+
+    Combines AIMD (additive-increase / multiplicative-decrease) concurrency
+    control with header-driven backoff: every sustained run of successes
+    raises the in-flight request limit by one, while a 429 or 5xx halves it
+    and pauses new requests for the server-advertised retry-after (or one
+    second if the server didn't say). A sliding window of recent request
+    timestamps is kept so callers can inspect the current request rate.
+
+    Usage:
+        limiter = RateLimiter()
+        async with limiter:
+            async with session.get(url) as response:
+                limiter.record_response(response.status, response.headers)
+                ...
+    """
+
+    SUCCESSES_PER_INCREASE = 10  # additive increase after this many clean responses
+    LOW_REMAINING_RATIO = 0.1    # proactively pause when quota headers run this low
+
+    def __init__(self, max_concurrency=8, window=60.0):
+        self._max = max_concurrency
+        self._limit = max_concurrency
+        self._sem = asyncio.Semaphore(max_concurrency)
+        self._debt = 0          # permits to swallow after a multiplicative decrease
+        self._successes = 0
+        self._resume_at = 0.0   # monotonic time before which new requests wait
+        self._window = window
+        self._recent = collections.deque(maxlen=256)  # timestamps of recent acquires
+
+    @property
+    def current_limit(self):
+        return self._limit
+
+    def request_rate(self):
+        """Requests started within the sliding window."""
+        cutoff = time.monotonic() - self._window
+        return sum(1 for t in self._recent if t >= cutoff)
+
+    async def acquire(self):
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await self._sem.acquire()
+        self._recent.append(time.monotonic())
+
+    def release(self):
+        # Swallow permits owed from a recent multiplicative decrease instead
+        # of returning them to the pool.
+        if self._debt > 0:
+            self._debt -= 1
+        else:
+            self._sem.release()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+    def record_response(self, status, headers=None):
+        """Feed a response's status and headers back into the controller."""
+        headers = headers or {}
+        if status == 429 or status >= 500:
+            new_limit = max(1, self._limit // 2)
+            self._debt += self._limit - new_limit
+            self._limit = new_limit
+            self._successes = 0
+            pause = self._retry_after_seconds(headers)
+            self._resume_at = max(self._resume_at, time.monotonic() + pause)
+            return
+
+        self._successes += 1
+        if self._successes >= self.SUCCESSES_PER_INCREASE and self._limit < self._max:
+            self._limit += 1
+            self._successes = 0
+            if self._debt > 0:
+                self._debt -= 1
+            else:
+                self._sem.release()
+
+        self._check_quota_headers(headers)
+
+    def _retry_after_seconds(self, headers):
+        value = headers.get("Retry-After") or headers.get("retry-after")
+        if value:
+            try:
+                return max(0.5, float(value))
+            except ValueError:
+                pass
+        return 1.0
+
+    def _check_quota_headers(self, headers):
+        # Providers name these differently (x-ratelimit-remaining,
+        # x-ratelimit-remaining-requests, ...); match on the prefix.
+        remaining = limit = None
+        for key, value in headers.items():
+            lowered = key.lower()
+            if lowered.startswith("x-ratelimit-remaining"):
+                try:
+                    remaining = float(value)
+                except ValueError:
+                    pass
+            elif lowered.startswith("x-ratelimit-limit"):
+                try:
+                    limit = float(value)
+                except ValueError:
+                    pass
+        if remaining is not None and limit:
+            if remaining / limit < self.LOW_REMAINING_RATIO:
+                self._resume_at = max(self._resume_at, time.monotonic() + 1.0)